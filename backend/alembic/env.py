@@ -26,7 +26,8 @@ config.set_main_option("sqlalchemy.url", settings.sync_database_url)
 
 # Interpret the config file for Python logging.
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    # No deshabilitar los loggers de la app si se ejecuta desde el lifespan
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # add your model's MetaData object here
 target_metadata = Base.metadata
@@ -51,7 +52,18 @@ def run_migrations_online() -> None:
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
+        # NullPool no cuesta conexiones extra: toda la ejecución reutiliza la
+        # única conexión abierta abajo. El DDL CONCURRENTLY se aísla en cada
+        # migración con op.get_context().autocommit_block(), no con
+        # isolation_level="AUTOCOMMIT" global (perdería la atomicidad del resto).
         poolclass=pool.NullPool,
+        # Evita que un ALTER TABLE bloqueado deje el proceso colgado
+        connect_args={
+            "options": (
+                f"-c lock_timeout={settings.migration_lock_timeout} "
+                f"-c statement_timeout={settings.migration_statement_timeout}"
+            )
+        },
     )
 
     with connectable.connect() as connection:
@@ -4,12 +4,25 @@ Revision ID: update_analysis_relations
 Revises: 5c1612cd246b
 Create Date: 2025-11-20 00:00:00.000000
 
+Migra analysis en sitio (add-backfill-constraint) en lugar de recrearla.
+
+Política de datos:
+- Reasignación: cada análisis sin proyecto se asigna al proyecto más
+  antiguo (created_at) de su usuario. Es una aproximación: el esquema
+  anterior no guardaba a qué proyecto pertenecía. El número de filas
+  reasignadas se registra en el log de alembic.
+- Pérdida de datos: los análisis que no pueden cumplir las FKs (sin
+  user_id, con un user_id que no existe o cuyo usuario no tiene
+  proyectos) se MUEVEN a la tabla analysis_orphaned antes de borrarlos
+  de analysis, y su número se registra en el log. downgrade() los
+  devuelve a analysis; revisarlos y eliminar la tabla a mano cuando ya
+  no hagan falta.
 """
+import logging
 from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision: str = 'update_analysis_relations'
@@ -17,66 +30,185 @@ down_revision: Union[str, Sequence[str], None] = '5c1612cd246b'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# Tamaño de lote para el backfill (mantiene cortos los locks de fila)
+BATCH_SIZE = 1000
+
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # Crear nueva tabla con estructura corregida
-    op.create_table('analysis_new',
-        sa.Column('id', sa.String(), nullable=False),
-        sa.Column('name', sa.String(length=200), nullable=True),
-        sa.Column('code', sa.Text(), nullable=False),
-        sa.Column('total_lines', sa.Integer(), nullable=False),
-        sa.Column('code_lines', sa.Integer(), nullable=False),
-        sa.Column('complexity', sa.Integer(), nullable=False),
-        sa.Column('num_functions', sa.Integer(), nullable=False),
-        sa.Column('num_classes', sa.Integer(), nullable=False),
-        sa.Column('num_imports', sa.Integer(), nullable=False),
-        sa.Column('functions_data', sa.JSON(), nullable=True),
-        sa.Column('project_id', sa.String(), nullable=False),
-        sa.Column('user_id', sa.String(), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
-        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
+    # 1. Agregar columnas nuevas como nullable (operación solo de catálogo)
+    op.add_column('analysis', sa.Column('name', sa.String(length=200), nullable=True))
+    op.add_column('analysis', sa.Column('project_id', sa.String(), nullable=True))
+
+    # varchar(255) -> varchar es binario-compatible: no reescribe la tabla.
+    # analysis.id se queda como UUID aquí; su cambio a String reescribe la
+    # tabla y vive en su propia migración (b9d1f3a5c7e6).
+    op.alter_column(
+        'analysis', 'user_id',
+        existing_type=sa.String(length=255),
+        type_=sa.String(),
+        existing_nullable=True,
     )
 
-    # Crear índices
-    op.create_index(op.f('ix_analysis_new_project_id'), 'analysis_new', ['project_id'], unique=False)
-    op.create_index(op.f('ix_analysis_new_user_id'), 'analysis_new', ['user_id'], unique=False)
+    # 2. Backfill por lotes, cada lote en su propia transacción.
+    # Cada análisis se asigna al proyecto más antiguo de su usuario.
+    connection = op.get_bind()
+    reassigned = 0
+    with op.get_context().autocommit_block():
+        while True:
+            result = connection.execute(
+                sa.text(
+                    """
+                    UPDATE analysis a
+                    SET project_id = (
+                        SELECT p.id FROM projects p
+                        WHERE p.owner_id = a.user_id
+                        ORDER BY p.created_at
+                        LIMIT 1
+                    )
+                    WHERE a.id IN (
+                        SELECT an.id FROM analysis an
+                        WHERE an.project_id IS NULL
+                          AND EXISTS (
+                              SELECT 1 FROM projects p
+                              WHERE p.owner_id = an.user_id
+                          )
+                        LIMIT :batch_size
+                    )
+                    """
+                ),
+                {"batch_size": BATCH_SIZE},
+            )
+            if result.rowcount == 0:
+                break
+            reassigned += result.rowcount
+    logger.warning(
+        "analysis: %d filas asignadas al proyecto más antiguo de su usuario",
+        reassigned,
+    )
 
-    # Eliminar tabla antigua (si existe y tiene datos, migrarlos antes)
-    op.drop_table('analysis')
+    # Los análisis sin usuario o proyecto válido no pueden cumplir las FKs:
+    # se mueven por lotes a analysis_orphaned en vez de descartarlos
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS analysis_orphaned "
+        "(LIKE analysis INCLUDING DEFAULTS)"
+    )
+    orphaned = 0
+    with op.get_context().autocommit_block():
+        while True:
+            result = connection.execute(
+                sa.text(
+                    """
+                    WITH moved AS (
+                        DELETE FROM analysis
+                        WHERE id IN (
+                            SELECT an.id FROM analysis an
+                            WHERE an.project_id IS NULL
+                               OR an.user_id IS NULL
+                               OR NOT EXISTS (
+                                   SELECT 1 FROM users u
+                                   WHERE u.id = an.user_id
+                               )
+                            LIMIT :batch_size
+                        )
+                        RETURNING *
+                    )
+                    INSERT INTO analysis_orphaned SELECT * FROM moved
+                    """
+                ),
+                {"batch_size": BATCH_SIZE},
+            )
+            if result.rowcount == 0:
+                break
+            orphaned += result.rowcount
+    if orphaned:
+        logger.warning(
+            "analysis: %d filas sin usuario/proyecto válido movidas a "
+            "analysis_orphaned",
+            orphaned,
+        )
+
+    # 3. Restricciones NOT NULL y foreign keys sin bloquear escrituras.
+    # Cada sentencia va en su propia transacción (autocommit_block()):
+    # - ADD CONSTRAINT ... NOT VALID solo toca el catálogo
+    # - VALIDATE CONSTRAINT recorre la tabla con SHARE UPDATE EXCLUSIVE,
+    #   que no bloquea lecturas ni escrituras
+    # - con un CHECK (col IS NOT NULL) ya validado, SET NOT NULL no vuelve
+    #   a recorrer la tabla (Postgres 12+) y el CHECK se elimina después
+    with op.get_context().autocommit_block():
+        for column in ('project_id', 'user_id'):
+            check = f"analysis_{column}_not_null"
+            op.execute(
+                f"ALTER TABLE analysis ADD CONSTRAINT {check} "
+                f"CHECK ({column} IS NOT NULL) NOT VALID"
+            )
+            op.execute(f"ALTER TABLE analysis VALIDATE CONSTRAINT {check}")
+            op.execute(f"ALTER TABLE analysis ALTER COLUMN {column} SET NOT NULL")
+            op.execute(f"ALTER TABLE analysis DROP CONSTRAINT {check}")
 
-    # Renombrar nueva tabla
-    op.rename_table('analysis_new', 'analysis')
+        op.execute(
+            "ALTER TABLE analysis ADD CONSTRAINT analysis_project_id_fkey "
+            "FOREIGN KEY (project_id) REFERENCES projects (id) "
+            "ON DELETE CASCADE NOT VALID"
+        )
+        op.execute("ALTER TABLE analysis VALIDATE CONSTRAINT analysis_project_id_fkey")
+        op.execute(
+            "ALTER TABLE analysis ADD CONSTRAINT analysis_user_id_fkey "
+            "FOREIGN KEY (user_id) REFERENCES users (id) "
+            "ON DELETE CASCADE NOT VALID"
+        )
+        op.execute("ALTER TABLE analysis VALIDATE CONSTRAINT analysis_user_id_fkey")
 
-    # Renombrar índices
-    op.execute("ALTER INDEX ix_analysis_new_project_id RENAME TO ix_analysis_project_id")
-    op.execute("ALTER INDEX ix_analysis_new_user_id RENAME TO ix_analysis_user_id")
+    # 4. Crear índices sin bloquear escrituras.
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción,
+    # por eso se usa autocommit_block(). El DROP previo limpia índices
+    # inválidos que pudieran quedar de un intento anterior fallido.
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_analysis_project_id")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_analysis_project_id "
+            "ON analysis (project_id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_analysis_user_id")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_analysis_user_id "
+            "ON analysis (user_id)"
+        )
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # Crear tabla antigua
-    op.create_table('analysis_old',
-        sa.Column('id', postgresql.UUID(), nullable=False),
-        sa.Column('code', sa.Text(), nullable=False),
-        sa.Column('total_lines', sa.Integer(), nullable=False),
-        sa.Column('code_lines', sa.Integer(), nullable=False),
-        sa.Column('complexity', sa.Integer(), nullable=False),
-        sa.Column('num_functions', sa.Integer(), nullable=False),
-        sa.Column('num_classes', sa.Integer(), nullable=False),
-        sa.Column('num_imports', sa.Integer(), nullable=False),
-        sa.Column('functions_data', sa.JSON(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
-        sa.Column('user_id', sa.String(length=255), nullable=True),
-        sa.PrimaryKeyConstraint('id')
+    # Las BDs que ejecutaron la versión original de esta migración no
+    # tienen analysis_orphaned; se crea vacía para que el INSERT final valga
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS analysis_orphaned "
+        "(LIKE analysis INCLUDING DEFAULTS)"
     )
+    op.drop_index('ix_analysis_user_id', table_name='analysis')
+    op.drop_index('ix_analysis_project_id', table_name='analysis')
+    op.drop_constraint('analysis_user_id_fkey', 'analysis', type_='foreignkey')
+    op.drop_constraint('analysis_project_id_fkey', 'analysis', type_='foreignkey')
 
-    # Eliminar tabla nueva
-    op.drop_index(op.f('ix_analysis_user_id'), table_name='analysis')
-    op.drop_index(op.f('ix_analysis_project_id'), table_name='analysis')
-    op.drop_table('analysis')
+    op.alter_column(
+        'analysis', 'user_id',
+        existing_type=sa.String(),
+        type_=sa.String(length=255),
+        nullable=True,
+    )
 
-    # Renombrar tabla antigua
-    op.rename_table('analysis_old', 'analysis')
+    op.drop_column('analysis', 'project_id')
+    op.drop_column('analysis', 'name')
+
+    # Devolver las filas apartadas durante el upgrade
+    op.execute(
+        "INSERT INTO analysis (id, code, total_lines, code_lines, complexity, "
+        "num_functions, num_classes, num_imports, functions_data, created_at, "
+        "user_id) "
+        "SELECT id, code, total_lines, code_lines, complexity, num_functions, "
+        "num_classes, num_imports, functions_data, created_at, user_id "
+        "FROM analysis_orphaned"
+    )
+    op.drop_table('analysis_orphaned')
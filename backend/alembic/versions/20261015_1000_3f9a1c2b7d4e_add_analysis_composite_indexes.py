@@ -0,0 +1,54 @@
+"""add analysis composite indexes
+
+Revision ID: 3f9a1c2b7d4e
+Revises: update_analysis_relations
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2b7d4e'
+down_revision: Union[str, Sequence[str], None] = 'update_analysis_relations'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    # Los índices compuestos reemplazan a los de una sola columna, que
+    # quedan cubiertos por su columna inicial.
+    with op.get_context().autocommit_block():
+        # Búsquedas por id + user_id (get/delete/compare)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_analysis_user_id_id")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_analysis_user_id_id "
+            "ON analysis (user_id, id)"
+        )
+        # Listado por proyecto ordenado por fecha sin nodo Sort
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_analysis_project_id_created_at")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_analysis_project_id_created_at "
+            "ON analysis (project_id, created_at DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_analysis_user_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_analysis_project_id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_analysis_project_id "
+            "ON analysis (project_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_analysis_user_id "
+            "ON analysis (user_id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_analysis_project_id_created_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_analysis_user_id_id")
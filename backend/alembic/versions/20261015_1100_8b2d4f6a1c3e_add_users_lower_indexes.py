@@ -0,0 +1,43 @@
+"""add users lower indexes
+
+Revision ID: 8b2d4f6a1c3e
+Revises: 3f9a1c2b7d4e
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d4f6a1c3e'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2b7d4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índices funcionales para login y registro sin distinguir mayúsculas.
+    # CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    # Falla si ya existen emails o usernames que solo difieren en mayúsculas:
+    # deben resolverse a mano antes de aplicar la migración.
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY ix_users_email_lower "
+            "ON users (lower(email))"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_username_lower")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY ix_users_username_lower "
+            "ON users (lower(username))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_username_lower")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower")
@@ -0,0 +1,109 @@
+"""users id native uuid
+
+Revision ID: c4e6a8b0d2f1
+Revises: 8b2d4f6a1c3e
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e6a8b0d2f1'
+down_revision: Union[str, Sequence[str], None] = '8b2d4f6a1c3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_analysis_user_id_fk() -> None:
+    """
+    Elimina la FK analysis.user_id, tenga el nombre que tenga.
+
+    En las BDs que ejecutaron la versión original de la migración
+    20251120 la FK se creó sobre analysis_new y Postgres conserva el
+    nombre tras renombrar la tabla (analysis_new_user_id_fkey).
+    """
+    for name in ('analysis_user_id_fkey', 'analysis_new_user_id_fkey'):
+        op.execute(f"ALTER TABLE analysis DROP CONSTRAINT IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Las FKs no permiten cambiar el tipo de un lado solo: se quitan,
+    # se convierten las tres columnas y se vuelven a crear
+    _drop_analysis_user_id_fk()
+    op.drop_constraint('projects_owner_id_fkey', 'projects', type_='foreignkey')
+
+    op.alter_column(
+        'users', 'id',
+        existing_type=sa.String(),
+        type_=postgresql.UUID(),
+        postgresql_using='id::uuid',
+        server_default=sa.text('gen_random_uuid()'),
+        existing_nullable=False
+    )
+    op.alter_column(
+        'projects', 'owner_id',
+        existing_type=sa.String(),
+        type_=postgresql.UUID(),
+        postgresql_using='owner_id::uuid',
+        existing_nullable=False
+    )
+    op.alter_column(
+        'analysis', 'user_id',
+        existing_type=sa.String(),
+        type_=postgresql.UUID(),
+        postgresql_using='user_id::uuid',
+        existing_nullable=False
+    )
+
+    op.create_foreign_key(
+        'projects_owner_id_fkey', 'projects', 'users',
+        ['owner_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'analysis_user_id_fkey', 'analysis', 'users',
+        ['user_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_analysis_user_id_fk()
+    op.drop_constraint('projects_owner_id_fkey', 'projects', type_='foreignkey')
+
+    op.alter_column(
+        'analysis', 'user_id',
+        existing_type=postgresql.UUID(),
+        type_=sa.String(),
+        postgresql_using='user_id::text',
+        existing_nullable=False
+    )
+    op.alter_column(
+        'projects', 'owner_id',
+        existing_type=postgresql.UUID(),
+        type_=sa.String(),
+        postgresql_using='owner_id::text',
+        existing_nullable=False
+    )
+    op.alter_column(
+        'users', 'id',
+        existing_type=postgresql.UUID(),
+        type_=sa.String(),
+        postgresql_using='id::text',
+        server_default=None,
+        existing_nullable=False
+    )
+
+    op.create_foreign_key(
+        'projects_owner_id_fkey', 'projects', 'users',
+        ['owner_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'analysis_user_id_fkey', 'analysis', 'users',
+        ['user_id'], ['id'], ondelete='CASCADE'
+    )
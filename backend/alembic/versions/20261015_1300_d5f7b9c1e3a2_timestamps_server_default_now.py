@@ -0,0 +1,33 @@
+"""timestamps server default now
+
+Revision ID: d5f7b9c1e3a2
+Revises: c4e6a8b0d2f1
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f7b9c1e3a2'
+down_revision: Union[str, Sequence[str], None] = 'c4e6a8b0d2f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SET DEFAULT solo cambia el catálogo: no reescribe filas existentes
+    op.alter_column('users', 'created_at', server_default=sa.func.now())
+    op.alter_column('users', 'updated_at', server_default=sa.func.now())
+    op.alter_column('analysis', 'created_at', server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('analysis', 'created_at', server_default=None)
+    op.alter_column('users', 'updated_at', server_default=None)
+    op.alter_column('users', 'created_at', server_default=None)
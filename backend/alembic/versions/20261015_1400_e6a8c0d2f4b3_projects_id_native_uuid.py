@@ -0,0 +1,85 @@
+"""projects id native uuid
+
+Revision ID: e6a8c0d2f4b3
+Revises: d5f7b9c1e3a2
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a8c0d2f4b3'
+down_revision: Union[str, Sequence[str], None] = 'd5f7b9c1e3a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_analysis_project_id_fk() -> None:
+    """
+    Elimina la FK analysis.project_id, tenga el nombre que tenga.
+
+    En las BDs que ejecutaron la versión original de la migración
+    20251120 la FK se creó sobre analysis_new y Postgres conserva el
+    nombre tras renombrar la tabla (analysis_new_project_id_fkey).
+    """
+    for name in ('analysis_project_id_fkey', 'analysis_new_project_id_fkey'):
+        op.execute(f"ALTER TABLE analysis DROP CONSTRAINT IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # La FK exige el mismo tipo en ambos lados: se quita, se convierten
+    # projects.id y analysis.project_id y se vuelve a crear
+    _drop_analysis_project_id_fk()
+
+    op.alter_column(
+        'projects', 'id',
+        existing_type=sa.String(),
+        type_=postgresql.UUID(),
+        postgresql_using='id::uuid',
+        server_default=sa.text('gen_random_uuid()'),
+        existing_nullable=False
+    )
+    op.alter_column(
+        'analysis', 'project_id',
+        existing_type=sa.String(),
+        type_=postgresql.UUID(),
+        postgresql_using='project_id::uuid',
+        existing_nullable=False
+    )
+
+    op.create_foreign_key(
+        'analysis_project_id_fkey', 'analysis', 'projects',
+        ['project_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_analysis_project_id_fk()
+
+    op.alter_column(
+        'analysis', 'project_id',
+        existing_type=postgresql.UUID(),
+        type_=sa.String(),
+        postgresql_using='project_id::text',
+        existing_nullable=False
+    )
+    op.alter_column(
+        'projects', 'id',
+        existing_type=postgresql.UUID(),
+        type_=sa.String(),
+        postgresql_using='id::text',
+        server_default=None,
+        existing_nullable=False
+    )
+
+    op.create_foreign_key(
+        'analysis_project_id_fkey', 'analysis', 'projects',
+        ['project_id'], ['id'], ondelete='CASCADE'
+    )
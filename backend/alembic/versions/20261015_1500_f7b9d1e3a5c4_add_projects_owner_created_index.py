@@ -0,0 +1,42 @@
+"""add projects owner created index
+
+Revision ID: f7b9d1e3a5c4
+Revises: e6a8c0d2f4b3
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b9d1e3a5c4'
+down_revision: Union[str, Sequence[str], None] = 'e6a8c0d2f4b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    # El índice compuesto reemplaza a ix_projects_owner_id, cubierto por
+    # su columna inicial.
+    with op.get_context().autocommit_block():
+        # Listado por propietario ordenado por fecha sin nodo Sort
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_projects_owner_created")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_projects_owner_created "
+            "ON projects (owner_id, created_at DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_projects_owner_id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_projects_owner_id "
+            "ON projects (owner_id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_projects_owner_created")
@@ -0,0 +1,31 @@
+"""projects timestamps server default
+
+Revision ID: a8c0e2f4b6d5
+Revises: f7b9d1e3a5c4
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c0e2f4b6d5'
+down_revision: Union[str, Sequence[str], None] = 'f7b9d1e3a5c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SET DEFAULT solo cambia el catálogo: no reescribe filas existentes
+    op.alter_column('projects', 'created_at', server_default=sa.func.now())
+    op.alter_column('projects', 'updated_at', server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('projects', 'updated_at', server_default=None)
+    op.alter_column('projects', 'created_at', server_default=None)
@@ -0,0 +1,53 @@
+"""analysis id to string
+
+Revision ID: b9d1f3a5c7e6
+Revises: a8c0e2f4b6d5
+Create Date: 2026-10-15 17:00:00.000000
+
+Convierte analysis.id de UUID a String para que coincida con el modelo.
+
+ATENCIÓN: el cambio de tipo REESCRIBE TODA LA TABLA analysis (incluida la
+columna code) bajo un lock ACCESS EXCLUSIVE: lecturas y escrituras sobre
+analysis quedan bloqueadas mientras dura. Ejecutarla en una ventana de
+mantenimiento si la tabla es grande.
+
+Las BDs que ejecutaron la versión original de 20251120 ya tienen id como
+String; en ellas la migración no hace nada.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d1f3a5c7e6'
+down_revision: Union[str, Sequence[str], None] = 'a8c0e2f4b6d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _alter_analysis_id(from_type: str, to_type: str, using: str) -> None:
+    """Cambia el tipo de analysis.id solo si todavía es from_type."""
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF (SELECT data_type FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = 'analysis'
+                  AND column_name = 'id') = '{from_type}' THEN
+                ALTER TABLE analysis ALTER COLUMN id TYPE {to_type} USING {using};
+            END IF;
+        END $$;
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _alter_analysis_id('uuid', 'VARCHAR', 'id::text')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _alter_analysis_id('character varying', 'UUID', 'id::uuid')
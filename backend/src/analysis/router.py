@@ -2,10 +2,13 @@
 Endpoints para historial de análisis de código.
 """
 from typing import Annotated
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, delete, exists, insert, lambda_stmt, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from src.analysis.schemas import (
     AnalysisCompare,
@@ -17,12 +20,32 @@ from src.auth.dependencies import get_current_active_user
 from src.auth.models import User
 from src.core.database import get_db
 from src.core.logger import logger
-from src.models.analyze import FunctionInfo
 from src.models.database import Analysis
 from src.projects.models import Project
 
 router = APIRouter(prefix="/analyses", tags=["Análisis"])
 
+# Serializador compilado para listados (validación + JSON en pydantic-core)
+_ANALYSIS_LIST = TypeAdapter(list[AnalysisResponse])
+
+# Sentencias con SQL cacheado (lambda_stmt): se construyen y compilan una
+# sola vez; cada petición solo aporta los parámetros.
+_GET_ANALYSIS = lambda_stmt(lambda: select(Analysis).where(
+    Analysis.id == bindparam("aid"),
+    Analysis.user_id == bindparam("uid")
+))
+_DELETE_ANALYSIS = lambda_stmt(lambda: delete(Analysis).where(
+    Analysis.id == bindparam("aid"),
+    Analysis.user_id == bindparam("uid")
+))
+# La comparación solo usa métricas: no se transfiere la columna code
+_COMPARE_ANALYSES = lambda_stmt(
+    lambda: select(Analysis).options(defer(Analysis.code)).where(
+        Analysis.id.in_(bindparam("aids", expanding=True)),
+        Analysis.user_id == bindparam("uid")
+    )
+)
+
 
 @router.post("", response_model=AnalysisResponse, status_code=status.HTTP_201_CREATED)
 async def save_analysis(
@@ -35,118 +58,100 @@ async def save_analysis(
 
     Requiere autenticación y que el proyecto pertenezca al usuario.
     """
-    # Verificar que el proyecto existe y pertenece al usuario
-    stmt = select(Project).where(
+    # Insertar solo si el proyecto existe y pertenece al usuario
+    # (INSERT ... SELECT ... WHERE EXISTS, un único round trip)
+    values = {
+        "name": analysis_data.name,
+        "code": analysis_data.code,
+        "total_lines": analysis_data.total_lines,
+        "code_lines": analysis_data.code_lines,
+        "complexity": analysis_data.complexity,
+        "num_functions": analysis_data.num_functions,
+        "num_classes": analysis_data.num_classes,
+        "num_imports": analysis_data.num_imports,
+        "functions_data": analysis_data.functions_data,
+        "project_id": analysis_data.project_id,
+        "user_id": current_user.id,
+    }
+    columns = Analysis.__table__.c
+    owned_project = exists().where(
         Project.id == analysis_data.project_id,
         Project.owner_id == current_user.id
     )
+    stmt = insert(Analysis).from_select(
+        list(values),
+        select(*[
+            literal(value, columns[key].type).label(key)
+            for key, value in values.items()
+        ]).where(owned_project)
+    ).returning(Analysis)
+
     result = await db.execute(stmt)
-    project = result.scalar_one_or_none()
+    new_analysis = result.scalar_one_or_none()
 
-    if not project:
+    if not new_analysis:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Proyecto no encontrado"
         )
 
-    # Crear análisis
-    new_analysis = Analysis(
-        name=analysis_data.name,
-        code=analysis_data.code,
-        total_lines=analysis_data.total_lines,
-        code_lines=analysis_data.code_lines,
-        complexity=analysis_data.complexity,
-        num_functions=analysis_data.num_functions,
-        num_classes=analysis_data.num_classes,
-        num_imports=analysis_data.num_imports,
-        functions_data=analysis_data.functions_data,
-        project_id=analysis_data.project_id,
-        user_id=current_user.id
-    )
-
-    db.add(new_analysis)
     await db.commit()
-    await db.refresh(new_analysis)
-
-    logger.info(f"Análisis guardado: {new_analysis.id} para proyecto {project.name}")
-
-    # Convertir functions_data a lista de FunctionInfo
-    functions = []
-    if new_analysis.functions_data:
-        functions = [FunctionInfo(**func) for func in new_analysis.functions_data]
-
-    return AnalysisResponse(
-        id=new_analysis.id,
-        name=new_analysis.name,
-        total_lines=new_analysis.total_lines,
-        code_lines=new_analysis.code_lines,
-        complexity=new_analysis.complexity,
-        num_functions=new_analysis.num_functions,
-        num_classes=new_analysis.num_classes,
-        num_imports=new_analysis.num_imports,
-        functions=functions,
-        project_id=new_analysis.project_id,
-        user_id=new_analysis.user_id,
-        created_at=new_analysis.created_at
-    )
+
+    logger.info(
+        f"Análisis guardado: {new_analysis.id} para proyecto {new_analysis.project_id}")
+
+    return AnalysisResponse.from_orm_row(new_analysis)
 
 
 @router.get("/project/{project_id}", response_model=list[AnalysisResponse])
 async def list_project_analyses(
-    project_id: str,
+    project_id: UUID,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> list[AnalysisResponse]:
+) -> Response:
     """
     Lista todos los análisis de un proyecto.
 
     Requiere autenticación y que el proyecto pertenezca al usuario.
     """
-    # Verificar que el proyecto existe y pertenece al usuario
-    stmt = select(Project).where(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    )
-    result = await db.execute(stmt)
-    project = result.scalar_one_or_none()
-
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Proyecto no encontrado"
+    # Obtener análisis del proyecto validando propiedad en la misma consulta.
+    # AnalysisResponse no incluye el código: no se transfiere la columna code.
+    stmt = (
+        select(Analysis)
+        .options(defer(Analysis.code))
+        .join(Project, Project.id == Analysis.project_id)
+        .where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id
         )
-
-    # Obtener análisis del proyecto
-    stmt = select(Analysis).where(
-        Analysis.project_id == project_id
-    ).order_by(Analysis.created_at.desc())
+        .order_by(Analysis.created_at.desc())
+    )
 
     result = await db.execute(stmt)
     analyses = result.scalars().all()
 
-    # Convertir a response
-    response_list = []
-    for analysis in analyses:
-        functions = []
-        if analysis.functions_data:
-            functions = [FunctionInfo(**func) for func in analysis.functions_data]
-
-        response_list.append(AnalysisResponse(
-            id=analysis.id,
-            name=analysis.name,
-            total_lines=analysis.total_lines,
-            code_lines=analysis.code_lines,
-            complexity=analysis.complexity,
-            num_functions=analysis.num_functions,
-            num_classes=analysis.num_classes,
-            num_imports=analysis.num_imports,
-            functions=functions,
-            project_id=analysis.project_id,
-            user_id=analysis.user_id,
-            created_at=analysis.created_at
+    # Sin resultados: distinguir proyecto vacío de proyecto inexistente o ajeno
+    if not analyses:
+        stmt = select(exists().where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id
         ))
-
-    return response_list
+        result = await db.execute(stmt)
+
+        if not result.scalar():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Proyecto no encontrado"
+            )
+
+    # Validar y serializar a JSON en una sola pasada de pydantic-core,
+    # sin que FastAPI vuelva a procesar la respuesta
+    return Response(
+        content=_ANALYSIS_LIST.dump_json(
+            _ANALYSIS_LIST.validate_python(analyses, from_attributes=True)
+        ),
+        media_type="application/json"
+    )
 
 
 @router.get("/{analysis_id}", response_model=AnalysisDetail)
@@ -154,17 +159,15 @@ async def get_analysis(
     analysis_id: str,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> AnalysisDetail:
+) -> Response:
     """
     Obtiene el detalle completo de un análisis incluyendo el código.
 
     Requiere autenticación y que el análisis pertenezca al usuario.
     """
-    stmt = select(Analysis).where(
-        Analysis.id == analysis_id,
-        Analysis.user_id == current_user.id
+    result = await db.execute(
+        _GET_ANALYSIS, {"aid": analysis_id, "uid": current_user.id}
     )
-    result = await db.execute(stmt)
     analysis = result.scalar_one_or_none()
 
     if not analysis:
@@ -173,25 +176,10 @@ async def get_analysis(
             detail="Análisis no encontrado"
         )
 
-    # Convertir functions_data a lista de FunctionInfo
-    functions = []
-    if analysis.functions_data:
-        functions = [FunctionInfo(**func) for func in analysis.functions_data]
-
-    return AnalysisDetail(
-        id=analysis.id,
-        name=analysis.name,
-        code=analysis.code,
-        total_lines=analysis.total_lines,
-        code_lines=analysis.code_lines,
-        complexity=analysis.complexity,
-        num_functions=analysis.num_functions,
-        num_classes=analysis.num_classes,
-        num_imports=analysis.num_imports,
-        functions=functions,
-        project_id=analysis.project_id,
-        user_id=analysis.user_id,
-        created_at=analysis.created_at
+    # Serializar directamente a JSON (el campo code puede ser grande)
+    return Response(
+        content=AnalysisDetail.from_orm_row(analysis).model_dump_json(),
+        media_type="application/json"
     )
 
 
@@ -206,20 +194,17 @@ async def delete_analysis(
 
     Requiere autenticación y que el análisis pertenezca al usuario.
     """
-    stmt = select(Analysis).where(
-        Analysis.id == analysis_id,
-        Analysis.user_id == current_user.id
+    # DELETE directo: no carga la fila (ni su columna code) para borrarla
+    result = await db.execute(
+        _DELETE_ANALYSIS, {"aid": analysis_id, "uid": current_user.id}
     )
-    result = await db.execute(stmt)
-    analysis = result.scalar_one_or_none()
 
-    if not analysis:
+    if result.rowcount == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Análisis no encontrado"
         )
 
-    await db.delete(analysis)
     await db.commit()
 
     logger.info(f"Análisis eliminado: {analysis_id}")
@@ -237,57 +222,25 @@ async def compare_analyses(
 
     Requiere autenticación y que ambos análisis pertenezcan al usuario.
     """
-    # Obtener primer análisis
-    stmt1 = select(Analysis).where(
-        Analysis.id == id1,
-        Analysis.user_id == current_user.id
+    # Obtener ambos análisis en una sola consulta
+    result = await db.execute(
+        _COMPARE_ANALYSES, {"aids": [id1, id2], "uid": current_user.id}
     )
-    result1 = await db.execute(stmt1)
-    analysis1 = result1.scalar_one_or_none()
+    analyses = {analysis.id: analysis for analysis in result.scalars().all()}
 
-    if not analysis1:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Análisis {id1} no encontrado"
-        )
-
-    # Obtener segundo análisis
-    stmt2 = select(Analysis).where(
-        Analysis.id == id2,
-        Analysis.user_id == current_user.id
-    )
-    result2 = await db.execute(stmt2)
-    analysis2 = result2.scalar_one_or_none()
+    for analysis_id in (id1, id2):
+        if analysis_id not in analyses:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Análisis {analysis_id} no encontrado"
+            )
 
-    if not analysis2:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Análisis {id2} no encontrado"
-        )
+    analysis1 = analyses[id1]
+    analysis2 = analyses[id2]
 
     # Convertir a responses
-    def to_response(analysis: Analysis) -> AnalysisResponse:
-        functions = []
-        if analysis.functions_data:
-            functions = [FunctionInfo(**func) for func in analysis.functions_data]
-
-        return AnalysisResponse(
-            id=analysis.id,
-            name=analysis.name,
-            total_lines=analysis.total_lines,
-            code_lines=analysis.code_lines,
-            complexity=analysis.complexity,
-            num_functions=analysis.num_functions,
-            num_classes=analysis.num_classes,
-            num_imports=analysis.num_imports,
-            functions=functions,
-            project_id=analysis.project_id,
-            user_id=analysis.user_id,
-            created_at=analysis.created_at
-        )
-
-    response1 = to_response(analysis1)
-    response2 = to_response(analysis2)
+    response1 = AnalysisResponse.from_orm_row(analysis1)
+    response2 = AnalysisResponse.from_orm_row(analysis2)
 
     # Calcular diferencias
     differences = {
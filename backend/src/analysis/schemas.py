@@ -2,11 +2,13 @@
 Schemas Pydantic para análisis guardados.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Self
+from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field, field_validator
 
 from src.models.analyze import FunctionInfo
+from src.models.database import Analysis
 
 
 class AnalysisCreate(BaseModel):
@@ -32,7 +34,7 @@ class AnalysisCreate(BaseModel):
         None,
         description="JSON con detalle de funciones"
     )
-    project_id: str = Field(
+    project_id: UUID = Field(
         ...,
         description="ID del proyecto al que pertenece"
     )
@@ -49,14 +51,34 @@ class AnalysisResponse(BaseModel):
     num_functions: int
     num_classes: int
     num_imports: int
-    functions: list[FunctionInfo] = Field(default_factory=list)
-    project_id: str
-    user_id: str
+    functions: list[FunctionInfo] = Field(
+        default_factory=list,
+        # Desde el ORM se lee directamente la columna functions_data
+        validation_alias=AliasChoices("functions", "functions_data")
+    )
+    project_id: UUID
+    user_id: UUID
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+    @field_validator("functions", mode="before")
+    @classmethod
+    def functions_not_null(cls, v: list | None) -> list:
+        """functions_data puede ser NULL en la base de datos."""
+        return v or []
+
+    @classmethod
+    def from_orm_row(cls, analysis: Analysis) -> Self:
+        """
+        Construye la respuesta desde un modelo Analysis de la BD.
+
+        Lee los atributos directamente (from_attributes), incluido
+        functions_data, sin expandir kwargs campo por campo.
+        """
+        return cls.model_validate(analysis)
+
 
 class AnalysisDetail(AnalysisResponse):
     """Schema con detalle completo incluyendo código."""
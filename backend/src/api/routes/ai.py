@@ -1,16 +1,62 @@
 """
 Rutas de API para servicios de IA.
 """
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+from uuid import UUID
 from src.auth.dependencies import get_current_active_user
 from src.auth.models import User
 from src.services.ai import get_ai_provider
+from src.core.config import settings
 from src.core.logger import logger
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
+T = TypeVar("T")
+
+# Llamadas a la IA en curso por usuario. Solo contiene usuarios con
+# llamadas activas: la entrada se elimina al volver a 0.
+_USER_IN_FLIGHT: Dict[UUID, int] = {}
+
+
+async def _call_provider(
+    user_id: UUID,
+    method: Callable[..., Awaitable[T]],
+    *args: Any
+) -> T:
+    """
+    Ejecuta una llamada al provider acotada por usuario y en tiempo.
+
+    Raises:
+        HTTPException 429: Si el usuario ya tiene el máximo de llamadas en curso
+        HTTPException 504: Si el provider no responde dentro de ai_timeout_s
+    """
+    # Comprobar e incrementar sin await entre medias: es atómico en el event loop
+    in_flight = _USER_IN_FLIGHT.get(user_id, 0)
+    if in_flight >= settings.ai_max_concurrent_per_user:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many AI requests in progress"
+        )
+
+    _USER_IN_FLIGHT[user_id] = in_flight + 1
+    try:
+        return await asyncio.wait_for(method(*args), timeout=settings.ai_timeout_s)
+    except TimeoutError:
+        logger.error(f"[AI] Timeout after {settings.ai_timeout_s}s")
+        raise HTTPException(
+            status_code=504,
+            detail="AI provider timed out"
+        )
+    finally:
+        remaining = _USER_IN_FLIGHT[user_id] - 1
+        if remaining:
+            _USER_IN_FLIGHT[user_id] = remaining
+        else:
+            del _USER_IN_FLIGHT[user_id]
+
 
 # =============================================================================
 # Request/Response Models
@@ -96,11 +142,18 @@ async def get_code_suggestions(
         logger.info(f"[AI] User {current_user.username} requesting suggestions for {len(request.code)} chars of code")
 
         provider = get_ai_provider()
-        suggestions = await provider.generate_suggestions(request.code, request.analysis)
+        suggestions = await _call_provider(
+            current_user.id,
+            provider.generate_suggestions,
+            request.code,
+            request.analysis
+        )
 
         logger.info(f"[AI] Generated {len(suggestions)} suggestions")
         return SuggestionsResponse(suggestions=suggestions)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[AI] Error generating suggestions: {e}")
         raise HTTPException(
@@ -126,7 +179,9 @@ async def explain_function(
         logger.info(f"[AI] User {current_user.username} requesting explanation for function '{request.function_name}'")
 
         provider = get_ai_provider()
-        explanation = await provider.explain_function(
+        explanation = await _call_provider(
+            current_user.id,
+            provider.explain_function,
             request.function_code,
             request.function_name
         )
@@ -134,6 +189,8 @@ async def explain_function(
         logger.info(f"[AI] Generated explanation ({len(explanation)} chars)")
         return ExplainResponse(explanation=explanation)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[AI] Error explaining function: {e}")
         raise HTTPException(
@@ -159,11 +216,17 @@ async def optimize_code(
         logger.info(f"[AI] User {current_user.username} requesting code optimization for {len(request.code)} chars")
 
         provider = get_ai_provider()
-        optimized = await provider.optimize_code(request.code)
+        optimized = await _call_provider(
+            current_user.id,
+            provider.optimize_code,
+            request.code
+        )
 
         logger.info(f"[AI] Generated optimized code ({len(optimized)} chars)")
         return OptimizeResponse(optimized_code=optimized)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[AI] Error optimizing code: {e}")
         raise HTTPException(
@@ -4,7 +4,7 @@ Endpoint para análisis de código.
 from fastapi import APIRouter, HTTPException, status
 
 from src.models.analyze import AnalyzeRequest, AnalyzeResponse
-from src.services.code_analyzer import analyze_code, CodeAnalysisError
+from src.services.code_analyzer import aanalyze_code, CodeAnalysisError
 from src.core.logger import logger
 
 
@@ -47,8 +47,8 @@ async def analyze_python_code(request: AnalyzeRequest) -> AnalyzeResponse:
     try:
         logger.info(f"Analizando código de {len(request.code)} caracteres")
 
-        # Analizar código
-        metrics = analyze_code(request.code)
+        # Analizar código (en el pool de procesos, fuera del event loop)
+        metrics = await aanalyze_code(request.code)
 
         logger.info(
             f"Análisis completado: {metrics['code_lines']} líneas, "
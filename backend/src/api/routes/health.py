@@ -5,12 +5,15 @@ from datetime import datetime
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from src.core.migrations import get_migration_status
+
 
 class HealthResponse(BaseModel):
     """Respuesta del health check."""
     status: str
     version: str
     timestamp: str
+    migration_status: str
 
 
 router = APIRouter(tags=["Health"])
@@ -28,4 +31,5 @@ async def health_check() -> HealthResponse:
         status="healthy",
         version="0.1.0",
         timestamp=datetime.utcnow().isoformat(),
+        migration_status=get_migration_status(),
     )
@@ -2,12 +2,14 @@
 Dependencies para autenticación en endpoints.
 """
 from typing import Annotated
+from uuid import UUID
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from src.auth.models import User
 from src.auth.schemas import TokenData
@@ -17,6 +19,24 @@ from src.core.database import get_db
 # OAuth2 scheme: espera token en header Authorization: Bearer <token>
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Cache en proceso user_id -> User para evitar un SELECT por request
+# autenticado. Por usuario y no por token: los logins sucesivos del mismo
+# usuario comparten entrada. Los endpoints que modifican un usuario llaman
+# a invalidate_user_cache, pero solo en su propio proceso: con varios
+# workers, o si se cambia la BD directamente (p. ej. desactivar a mano),
+# los demás procesos siguen usando el usuario cacheado hasta 60 segundos.
+_user_cache: TTLCache[UUID, User] = TTLCache(maxsize=50_000, ttl=60)
+
+
+def invalidate_user_cache(user_id: UUID) -> None:
+    """
+    Descarta el usuario cacheado.
+
+    Llamar tras modificar o desactivar un usuario para que el siguiente
+    request de este proceso lo lea de la BD.
+    """
+    _user_cache.pop(user_id, None)
+
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
@@ -50,16 +70,34 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    token_data = TokenData(user_id=user_id)
+    try:
+        token_data = TokenData(user_id=UUID(user_id))
+    except ValueError:
+        raise credentials_exception
 
-    # Buscar usuario en BD
-    stmt = select(User).where(User.id == token_data.user_id)
+    # Usuario cacheado: adjuntarlo a la sesión actual sin consultar la BD
+    cached_user = _user_cache.get(token_data.user_id)
+    if cached_user is not None:
+        return await db.merge(cached_user, load=False)
+
+    # Buscar usuario en BD (solo las columnas de UserResponse, sin el hash)
+    stmt = select(User).options(load_only(
+        User.id,
+        User.email,
+        User.username,
+        User.is_active,
+        User.is_superuser,
+        User.created_at,
+        User.updated_at,
+    )).where(User.id == token_data.user_id)
     result = await db.execute(stmt)
     user = result.scalar_one_or_none()
 
     if user is None:
         raise credentials_exception
 
+    _user_cache[user.id] = user
+
     return user
 
 
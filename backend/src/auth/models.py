@@ -1,10 +1,10 @@
 """
 Modelos de base de datos para autenticación.
 """
-from datetime import datetime, timezone
-from uuid import uuid4
+from datetime import datetime
+from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, DateTime, String
+from sqlalchemy import Boolean, DateTime, Index, String, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
@@ -27,10 +27,13 @@ class User(Base):
 
     __tablename__ = "users"
 
-    id: Mapped[str] = mapped_column(
-        String,
+    # UUID nativo (16 bytes) en lugar de texto; gen_random_uuid() cubre los
+    # INSERT que no pasan por el ORM
+    id: Mapped[UUID] = mapped_column(
+        Uuid,
         primary_key=True,
-        default=lambda: str(uuid4())
+        default=uuid4,
+        server_default=func.gen_random_uuid()
     )
 
     email: Mapped[str] = mapped_column(
@@ -64,30 +67,47 @@ class User(Base):
         nullable=False
     )
 
+    # Timestamps asignados por PostgreSQL (reloj de la BD)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False
     )
 
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False
     )
 
-    # Relaciones
+    # Unicidad sin distinguir mayúsculas: el login busca por lower(columna)
+    __table_args__ = (
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+        Index("ix_users_username_lower", func.lower(username), unique=True),
+    )
+
+    # Recuperar con RETURNING los timestamps generados por la BD también en
+    # UPDATE (la sesión async no puede cargarlos después de forma perezosa)
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Relaciones: lazy="raise" para que un acceso accidental falle en vez de
+    # lanzar una consulta por usuario (N+1). Cargar con selectinload cuando
+    # se necesiten. El borrado en cascada lo hace la FK (ON DELETE CASCADE).
     projects: Mapped[list["Project"]] = relationship(
         "Project",
         back_populates="owner",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise"
     )
 
     analyses: Mapped[list["Analysis"]] = relationship(
         "Analysis",
         back_populates="user",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise"
     )
 
     def __repr__(self) -> str:
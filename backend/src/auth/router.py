@@ -6,22 +6,27 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.auth.dependencies import get_current_active_user
+from src.auth.dependencies import get_current_active_user, invalidate_user_cache
 from src.auth.models import User
 from src.auth.schemas import TokenResponse, UserRegister, UserResponse
 from src.auth.security import (
+    aget_password_hash,
+    averify_password,
     create_access_token,
-    get_password_hash,
-    verify_password,
+    password_needs_rehash,
 )
 from src.core.config import settings
 from src.core.database import get_db
 
 router = APIRouter(prefix="/auth", tags=["Autenticación"])
 
+# Duración de los tokens emitidos (settings no cambia en runtime)
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=settings.access_token_expire_minutes)
+
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def register(
@@ -38,48 +43,62 @@ async def register(
     Returns:
         Token JWT y datos del usuario creado
     """
-    # Verificar si el email ya existe
-    stmt = select(User).where(User.email == user_data.email)
+    # Email y username se guardan en minúsculas
+    email = user_data.email.lower()
+    username = user_data.username.lower()
+
+    # Verificar email y username existentes en una sola consulta
+    stmt = select(User.email, User.username).where(
+        (func.lower(User.email) == email) | (func.lower(User.username) == username)
+    )
     result = await db.execute(stmt)
-    if result.scalar_one_or_none():
+    existing = result.all()
+
+    if any(row.email.lower() == email for row in existing):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El email ya está registrado"
         )
 
-    # Verificar si el username ya existe
-    stmt = select(User).where(User.username == user_data.username)
-    result = await db.execute(stmt)
-    if result.scalar_one_or_none():
+    if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El nombre de usuario ya está en uso"
         )
 
     # Crear usuario
-    hashed_password = get_password_hash(user_data.password)
+    # El KDF es CPU-bound: se ejecuta en su executor, no en el event loop
+    hashed_password = await aget_password_hash(user_data.password)
     new_user = User(
-        email=user_data.email,
-        username=user_data.username,
+        email=email,
+        username=username,
         hashed_password=hashed_password
     )
 
+    # id y flags tienen default en Python; los timestamps los asigna la BD
+    # (server_default now()) y vuelven con RETURNING (eager_defaults). Con
+    # expire_on_commit=False todo queda cargado: no hace falta refresh
     db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Registro concurrente con el mismo email o username
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El email o nombre de usuario ya está registrado"
+        )
 
     # Crear token
-    access_token_expires = timedelta(
-        minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": new_user.id},
-        expires_delta=access_token_expires
+        data={"sub": str(new_user.id)},
+        expires_delta=ACCESS_TOKEN_EXPIRES
     )
 
     return TokenResponse(
         access_token=access_token,
         token_type="bearer",
-        user=UserResponse.model_validate(new_user)
+        user=UserResponse.from_orm_row(new_user)
     )
 
 
@@ -97,16 +116,21 @@ async def login(
     Returns:
         Token JWT y datos del usuario
     """
-    # Buscar usuario por username o email
+    # Buscar usuario por username o email, sin distinguir mayúsculas
+    # (usa los índices ix_users_username_lower / ix_users_email_lower)
+    identifier = form_data.username.lower()
     stmt = select(User).where(
-        (User.username == form_data.username) | (
-            User.email == form_data.username)
+        (func.lower(User.username) == identifier) | (
+            func.lower(User.email) == identifier)
     )
     result = await db.execute(stmt)
     user = result.scalar_one_or_none()
 
     # Verificar usuario y password
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # El KDF es CPU-bound: se ejecuta en su executor, no en el event loop
+    if not user or not await averify_password(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario o password incorrectos",
@@ -120,18 +144,24 @@ async def login(
             detail="Usuario inactivo"
         )
 
+    # Actualizar hashes generados con parámetros anteriores (solo aquí se
+    # dispone del password en claro)
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await aget_password_hash(form_data.password)
+        await db.commit()
+        # updated_at ha cambiado: no servir la copia cacheada
+        invalidate_user_cache(user.id)
+
     # Crear token
-    access_token_expires = timedelta(
-        minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.id},
-        expires_delta=access_token_expires
+        data={"sub": str(user.id)},
+        expires_delta=ACCESS_TOKEN_EXPIRES
     )
 
     return TokenResponse(
         access_token=access_token,
         token_type="bearer",
-        user=UserResponse.model_validate(user)
+        user=UserResponse.from_orm_row(user)
     )
 
 
@@ -147,4 +177,4 @@ async def get_me(
     Returns:
         Datos del usuario actual
     """
-    return UserResponse.model_validate(current_user)
+    return UserResponse.from_orm_row(current_user)
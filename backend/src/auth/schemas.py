@@ -2,8 +2,12 @@
 Schemas de Pydantic para validación de datos de autenticación.
 """
 from datetime import datetime
+from typing import Self
+from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+from src.auth.models import User
 
 
 # ============================================================================
@@ -54,7 +58,7 @@ class UserLogin(BaseModel):
 class UserResponse(BaseModel):
     """Schema de respuesta con información del usuario (SIN password)."""
 
-    id: str
+    id: UUID
     email: str
     username: str
     is_active: bool
@@ -62,7 +66,25 @@ class UserResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True, validate_assignment=False)
+
+    @classmethod
+    def from_orm_row(cls, user: User) -> Self:
+        """
+        Construye la respuesta desde un modelo User de la BD.
+
+        Los datos vienen de la BD con los tipos correctos: se usa
+        model_construct para no revalidarlos campo por campo.
+        """
+        return cls.model_construct(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
 
 
 class TokenResponse(BaseModel):
@@ -85,4 +107,4 @@ class TokenResponse(BaseModel):
 class TokenData(BaseModel):
     """Schema para datos extraídos del token."""
 
-    user_id: str | None = None
+    user_id: UUID | None = None
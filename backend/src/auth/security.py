@@ -1,50 +1,158 @@
 """
 Utilidades de seguridad para autenticación.
+
+Nunca comparar secretos, hashes o firmas con ``==``: usar ``_ct_eq``
+(hmac.compare_digest), que tarda lo mismo sin importar dónde difieran.
+argon2-cffi y PyJWT ya comparan en tiempo constante internamente.
 """
-from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import hmac
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Any
 
-from jose import jwt
-from passlib.context import CryptContext
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 
 from src.core.config import settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Parámetros mínimos recomendados por OWASP para argon2id: mantienen el
+# verify por debajo de la latencia interactiva de un login
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Executor dedicado al KDF (argon2-cffi libera el GIL). Separado del
+# threadpool por defecto para que una ráfaga de logins no lo acapare.
+_kdf_executor: ThreadPoolExecutor | None = None
+
+# Tokens firmados recientemente por (sub, duración). TTL corto: un login
+# repetido dentro de la ventana reutiliza el token en lugar de volver a
+# serializar y firmar; su exp se adelanta como mucho 15 segundos.
+_token_cache: TTLCache[tuple[Any, int], str] = TTLCache(maxsize=10_000, ttl=15)
+_token_cache_lock = threading.Lock()
+
+# Duración por defecto de los tokens (settings no cambia en runtime)
+_DEFAULT_EXPIRES = timedelta(minutes=settings.access_token_expire_minutes)
+
+
+def _ct_eq(a: str, b: str) -> bool:
+    """Compara dos secretos en tiempo constante."""
+    return hmac.compare_digest(a.encode(), b.encode())
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica que un password en texto plano coincida con el hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Indica si el hash se generó con parámetros distintos a los actuales."""
+    return password_hasher.check_needs_rehash(hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Genera un hash seguro del password usando argon2."""
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
+
+
+def start_kdf_executor() -> None:
+    """
+    Crea el executor del KDF, con un hilo por CPU.
+    Se debe llamar al startup de la aplicación.
+    """
+    global _kdf_executor
+    _kdf_executor = ThreadPoolExecutor(
+        max_workers=os.cpu_count(),
+        thread_name_prefix="kdf"
+    )
+
+
+def shutdown_kdf_executor() -> None:
+    """
+    Cierra el executor del KDF.
+    Se debe llamar al shutdown de la aplicación.
+    """
+    global _kdf_executor
+    if _kdf_executor is not None:
+        _kdf_executor.shutdown(wait=False, cancel_futures=True)
+        _kdf_executor = None
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Versión async de verify_password: corre en el executor del KDF."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _kdf_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def aget_password_hash(password: str) -> str:
+    """Versión async de get_password_hash: corre en el executor del KDF."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_kdf_executor, get_password_hash, password)
 
 
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     """Crea un token JWT de acceso."""
-    to_encode = data.copy()
+    expires_seconds = int((expires_delta or _DEFAULT_EXPIRES).total_seconds())
 
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
+    # Solo se cachean tokens cuyo único claim es el sub
+    cache_key = None
+    if data.keys() == {"sub"}:
+        cache_key = (data["sub"], expires_seconds)
+        cached_token = _token_cache.get(cache_key)
+        if cached_token is not None:
+            return cached_token
 
-    to_encode.update({"exp": expire})
+    # exp como timestamp entero: es lo que acaba en el JWT (NumericDate)
+    to_encode = data.copy()
+    to_encode["exp"] = int(time.time()) + expires_seconds
     encoded_jwt = jwt.encode(
         to_encode,
         settings.secret_key,
         algorithm=settings.algorithm
     )
 
+    if cache_key is not None:
+        with _token_cache_lock:
+            _token_cache[cache_key] = encoded_jwt
+
     return encoded_jwt
 
 
+def _is_expired(token: str) -> bool:
+    """
+    Lee el exp del payload sin verificar la firma.
+
+    Solo sirve para descartar pronto tokens caducados: nunca se confía en un
+    claim sin pasar por jwt.decode. Ante cualquier formato inesperado
+    devuelve False y deja que jwt.decode decida.
+    """
+    try:
+        segment = token.split(".")[1]
+        payload = json.loads(
+            base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+        )
+        return payload["exp"] < time.time()
+    except Exception:
+        return False
+
+
 def decode_access_token(token: str) -> dict[str, Any] | None:
     """Decodifica y verifica un token JWT."""
+    # Token caducado: rechazar sin calcular el HMAC
+    if _is_expired(token):
+        return None
+
     try:
         payload = jwt.decode(
             token,
@@ -52,5 +160,5 @@ def decode_access_token(token: str) -> dict[str, Any] | None:
             algorithms=[settings.algorithm]
         )
         return payload
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         return None
@@ -1,8 +1,14 @@
 """
 Configuración central de la aplicación DevSpell.
 """
+from functools import cached_property
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Modos de ejecución de migraciones al iniciar la app
+MigrationMode = Literal["sync", "async", "skip"]
+
 
 class Settings(BaseSettings):
     """Configuración de la aplicación cargada desde variables de entorno."""
@@ -30,8 +36,16 @@ class Settings(BaseSettings):
     postgres_db: str = "devspell"
 
     # Database pool
-    database_pool_size: int = 5
+    database_pool_size: int = 20
     database_max_overflow: int = 10
+    database_pool_recycle: int = 300  # segundos
+    database_pool_timeout: int = 30  # segundos esperando una conexión libre
+
+    # Migraciones al iniciar la app: "sync" | "async" | "skip"
+    migration_mode: MigrationMode = "skip"
+    # Timeouts de Postgres para las conexiones de Alembic
+    migration_lock_timeout: str = "5s"
+    migration_statement_timeout: str = "30min"
 
     # Anthropic API
     anthropic_api_key: str = ""
@@ -41,6 +55,8 @@ class Settings(BaseSettings):
     ollama_base_url: str = "http://ollama:11434"
     ollama_model: str = "deepseek-coder:1.3b"
     ollama_timeout: int = 60
+    ai_timeout_s: int = 90  # Límite total por petición a /ai
+    ai_max_concurrent_per_user: int = 2
     gemini_api_key: str = ""  # Para futuro
 
     # Autenticación JWT
@@ -48,7 +64,8 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
-    @property
+    # Las URLs se calculan una sola vez: settings no cambia en runtime
+    @cached_property
     def database_url(self) -> str:
         """Construye la URL de conexión a PostgreSQL para asyncpg."""
         return (
@@ -56,7 +73,7 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
-    @property
+    @cached_property
     def sync_database_url(self) -> str:
         """URL de conexión síncrona para Alembic (psycopg2)."""
         return (
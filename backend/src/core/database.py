@@ -1,9 +1,10 @@
 """
 Configuración de base de datos con SQLAlchemy.
 """
+from contextlib import AsyncExitStack
 from typing import AsyncGenerator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
@@ -21,6 +22,9 @@ sync_engine = create_engine(
     settings.sync_database_url,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
+    pool_pre_ping=True,
+    pool_recycle=settings.database_pool_recycle,
+    pool_timeout=settings.database_pool_timeout,
     echo=False,  # Deshabilitado temporalmente para debug
 )
 
@@ -36,6 +40,9 @@ async_engine = create_async_engine(
     settings.database_url,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
+    pool_pre_ping=True,  # Descarta conexiones caídas antes de usarlas
+    pool_recycle=settings.database_pool_recycle,
+    pool_timeout=settings.database_pool_timeout,
     echo=False,  # Deshabilitado temporalmente para debug
 )
 
@@ -88,6 +95,25 @@ async def init_db() -> None:
         raise
 
 
+async def warm_up_pool() -> None:
+    """
+    Abre las conexiones del pool al iniciar la aplicación.
+
+    Así el primer request no paga el handshake (TCP + auth) con PostgreSQL.
+    Si la base de datos no está disponible solo se registra un warning.
+    """
+    try:
+        # Mantener todas abiertas a la vez para que el pool cree pool_size
+        async with AsyncExitStack() as stack:
+            for _ in range(settings.database_pool_size):
+                conn = await stack.enter_async_context(async_engine.connect())
+                await conn.execute(text("SELECT 1"))
+        logger.info(
+            f"✅ Pool de conexiones precalentado ({settings.database_pool_size})")
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo precalentar el pool de conexiones: {e}")
+
+
 async def close_db() -> None:
     """
     Cierra las conexiones de base de datos.
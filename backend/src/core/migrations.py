@@ -0,0 +1,83 @@
+"""
+Ejecución de migraciones de Alembic desde la aplicación.
+"""
+import asyncio
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+from src.core.config import MigrationMode
+from src.core.logger import logger
+
+# alembic.ini vive en la raíz del backend (backend/alembic.ini)
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Estado de las migraciones: pending | running | done | failed | skipped
+_migration_status = "pending"
+
+
+def get_migration_status() -> str:
+    """Retorna el estado actual de las migraciones."""
+    return _migration_status
+
+
+def run_migrations() -> None:
+    """
+    Aplica las migraciones pendientes (equivalente a `alembic upgrade head`).
+
+    Raises:
+        Exception: Si alguna migración falla
+    """
+    global _migration_status
+    _migration_status = "running"
+    logger.info("🗄️ Aplicando migraciones de base de datos...")
+
+    try:
+        config = Config(str(BACKEND_DIR / "alembic.ini"))
+        config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+        command.upgrade(config, "head")
+    except Exception as e:
+        _migration_status = "failed"
+        logger.error(f"❌ Error aplicando migraciones: {e}")
+        raise
+
+    _migration_status = "done"
+    logger.info("✅ Migraciones aplicadas")
+
+
+async def start_migrations(mode: MigrationMode) -> asyncio.Task | None:
+    """
+    Lanza las migraciones según el modo configurado.
+
+    Args:
+        mode: "sync" bloquea el startup hasta terminar, "async" las ejecuta
+            en segundo plano para que el servidor acepte requests de
+            inmediato, "skip" no hace nada (migraciones externas)
+
+    Returns:
+        Task en segundo plano si mode es "async", None en otro caso
+
+    Raises:
+        ValueError: Si el modo no es válido
+    """
+    global _migration_status
+
+    if mode == "sync":
+        await asyncio.to_thread(run_migrations)
+        return None
+
+    if mode == "async":
+        async def _run_in_background() -> None:
+            try:
+                await asyncio.to_thread(run_migrations)
+            except Exception:
+                logger.exception("❌ Las migraciones en segundo plano fallaron")
+
+        return asyncio.create_task(_run_in_background())
+
+    if mode == "skip":
+        _migration_status = "skipped"
+        return None
+
+    raise ValueError(f"Unknown migration mode: {mode}")
@@ -4,13 +4,22 @@ Aplicación principal de DevSpell API.
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from src.auth.security import shutdown_kdf_executor, start_kdf_executor
 from src.core.config import settings
+from src.core.database import close_db, warm_up_pool
 from src.core.logger import logger
+from src.core.migrations import start_migrations
 from src.api.routes import health, analyze, ai
 from src.auth.router import router as auth_router
 from src.projects.router import router as projects_router
 from src.analysis.router import router as analysis_router
+from src.services.ai import close_ai_provider
+from src.services.code_analyzer import (
+    shutdown_analysis_executor,
+    start_analysis_executor,
+)
 
 
 @asynccontextmanager
@@ -23,10 +32,21 @@ async def lifespan(app: FastAPI):
     logger.info(
         f"📚 Documentación disponible en: http://{settings.host}:{settings.port}/docs")
 
+    # Migraciones (en modo "async" se guarda la task para que no se recolecte)
+    app.state.migration_task = await start_migrations(settings.migration_mode)
+
+    await warm_up_pool()
+    start_kdf_executor()
+    start_analysis_executor()
+
     yield
 
     # Shutdown
     logger.info(f"👋 {settings.app_name} cerrando...")
+    shutdown_kdf_executor()
+    shutdown_analysis_executor()
+    await close_ai_provider()
+    await close_db()
 
 
 def create_app() -> FastAPI:
@@ -43,6 +63,8 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
+        # orjson serializa en C (rápido con payloads grandes como `code`)
+        default_response_class=ORJSONResponse,
     )
 
     # Configurar CORS
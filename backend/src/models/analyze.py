@@ -25,8 +25,9 @@ class AnalyzeRequest(BaseModel):
     @field_validator("code")
     @classmethod
     def validate_code_not_empty(cls, v: str) -> str:
-        """Valida que el código no esté vacío después de strip."""
-        if not v.strip():
+        """Valida que el código no esté vacío ni sea solo espacios."""
+        # isspace() no copia el texto como strip()
+        if v.isspace():
             raise ValueError("El código no puede estar vacío")
         return v
 
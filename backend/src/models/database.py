@@ -1,11 +1,13 @@
 """
 Modelos de base de datos con SQLAlchemy.
 """
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
-from uuid import uuid4
+from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import (
+    DateTime, ForeignKey, Index, Integer, JSON, String, Text, Uuid, func
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
@@ -61,38 +63,45 @@ class Analysis(Base):
     functions_data: Mapped[list | dict | None] = mapped_column(JSON, nullable=True)
 
     # Foreign Keys
-    project_id: Mapped[str] = mapped_column(
-        String,
+    project_id: Mapped[UUID] = mapped_column(
+        Uuid,
         ForeignKey("projects.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
-    user_id: Mapped[str] = mapped_column(
-        String,
+    user_id: Mapped[UUID] = mapped_column(
+        Uuid,
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False
     )
 
-    # Relaciones
+    # Índices compuestos para las consultas del router
+    __table_args__ = (
+        # Búsqueda por id + propietario (get/delete/compare)
+        Index("ix_analysis_user_id_id", "user_id", "id"),
+        # Listado por proyecto ordenado por fecha
+        Index("ix_analysis_project_id_created_at", "project_id", created_at.desc()),
+    )
+
+    # Relaciones: ningún endpoint las serializa, así que no se cargan
+    # (antes cada SELECT de Analysis hacía JOIN con projects y users)
     project: Mapped["Project"] = relationship(
         "Project",
         back_populates="analyses",
-        lazy="joined"
+        lazy="raise"
     )
 
     user: Mapped["User"] = relationship(
         "User",
         back_populates="analyses",
-        lazy="joined"
+        lazy="raise"
     )
 
     def __repr__(self) -> str:
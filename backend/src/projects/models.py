@@ -1,10 +1,10 @@
 """
 Modelos de base de datos para proyectos.
 """
-from datetime import datetime, timezone
-from uuid import uuid4
+from datetime import datetime
+from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
@@ -27,10 +27,12 @@ class Project(Base):
 
     __tablename__ = "projects"
 
-    id: Mapped[str] = mapped_column(
-        String,
+    # UUID nativo (16 bytes); gen_random_uuid() cubre los INSERT sin ORM
+    id: Mapped[UUID] = mapped_column(
+        Uuid,
         primary_key=True,
-        default=lambda: str(uuid4())
+        default=uuid4,
+        server_default=func.gen_random_uuid()
     )
 
     name: Mapped[str] = mapped_column(
@@ -44,31 +46,44 @@ class Project(Base):
         nullable=True
     )
 
-    owner_id: Mapped[str] = mapped_column(
-        String,
+    owner_id: Mapped[UUID] = mapped_column(
+        Uuid,
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
+    # Timestamps asignados por PostgreSQL (reloj de la BD)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False
     )
 
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False
     )
 
+    # Listado de proyectos del usuario ordenado por fecha: range scan sin
+    # nodo Sort. Cubre también los filtros por owner_id (columna inicial)
+    __table_args__ = (
+        Index("ix_projects_owner_created", "owner_id", created_at.desc()),
+    )
+
+    # Recuperar con RETURNING los timestamps generados por la BD (la sesión
+    # async no puede cargarlos después de forma perezosa)
+    __mapper_args__ = {"eager_defaults": True}
+
     # Relaciones
+    # lazy="raise": ningún endpoint usa el owner y "joined" añadía un JOIN
+    # con users a cada SELECT de Project. Cargarlo explícitamente donde haga
+    # falta: options(selectinload(Project.owner).load_only(User.username))
     owner: Mapped["User"] = relationship(
         "User",
         back_populates="projects",
-        lazy="joined"
+        lazy="raise"
     )
 
     analyses: Mapped[list["Analysis"]] = relationship(
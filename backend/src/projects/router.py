@@ -1,10 +1,12 @@
 """
 Endpoints para gestión de proyectos.
 """
-from typing import Annotated
+from typing import Annotated, Any
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.dependencies import get_current_active_user
@@ -18,7 +20,38 @@ from src.projects.schemas import (
     ProjectWithOwner,
 )
 
-router = APIRouter(prefix="/projects", tags=["Proyectos"])
+# Columnas de ProjectResponse, en su orden
+_PROJECT_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.owner_id,
+    Project.created_at,
+    Project.updated_at,
+)
+
+router = APIRouter(
+    prefix="/projects",
+    tags=["Proyectos"],
+    default_response_class=ORJSONResponse
+)
+
+
+def _project_to_dict(project: Project) -> dict[str, Any]:
+    """
+    Convierte un Project de la BD al payload de ProjectResponse.
+
+    Los endpoints devuelven ORJSONResponse con este dict: FastAPI no vuelve a
+    validar la respuesta contra response_model (que se mantiene para OpenAPI).
+    """
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "owner_id": project.owner_id,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at,
+    }
 
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -26,7 +59,7 @@ async def create_project(
     project_data: ProjectCreate,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> ProjectResponse:
+) -> ORJSONResponse:
     """
     Crea un nuevo proyecto para el usuario actual.
 
@@ -38,37 +71,43 @@ async def create_project(
         owner_id=current_user.id
     )
 
+    # eager_defaults: el INSERT devuelve los timestamps con RETURNING, no
+    # hace falta refresh
     db.add(new_project)
     await db.commit()
-    await db.refresh(new_project)
 
-    return ProjectResponse.model_validate(new_project)
+    return ORJSONResponse(
+        _project_to_dict(new_project),
+        status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get("", response_model=list[ProjectResponse])
 async def list_projects(
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> list[ProjectResponse]:
+) -> ORJSONResponse:
     """
     Lista todos los proyectos del usuario actual.
 
     Requiere autenticación.
     """
-    stmt = select(Project).where(Project.owner_id ==
-                                 current_user.id).order_by(Project.created_at.desc())
+    # Seleccionar columnas (no entidades): cada fila llega como mapping y se
+    # serializa directamente, sin instanciar Project ni pasar por el
+    # identity map de la sesión
+    stmt = select(*_PROJECT_COLUMNS).where(Project.owner_id ==
+                                           current_user.id).order_by(Project.created_at.desc())
     result = await db.execute(stmt)
-    projects = result.scalars().all()
 
-    return [ProjectResponse.model_validate(p) for p in projects]
+    return ORJSONResponse([dict(row) for row in result.mappings()])
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
-    project_id: str,
+    project_id: UUID,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> ProjectResponse:
+) -> ORJSONResponse:
     """
     Obtiene un proyecto específico por ID.
 
@@ -87,25 +126,40 @@ async def get_project(
             detail="Proyecto no encontrado"
         )
 
-    return ProjectResponse.model_validate(project)
+    return ORJSONResponse(_project_to_dict(project))
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
-    project_id: str,
+    project_id: UUID,
     project_data: ProjectUpdate,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> ProjectResponse:
+) -> ORJSONResponse:
     """
     Actualiza un proyecto existente.
 
     Solo el propietario puede actualizar el proyecto.
     """
-    stmt = select(Project).where(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    )
+    # Actualizar solo los campos proporcionados
+    values = {
+        key: value
+        for key, value in project_data.model_dump().items()
+        if value is not None
+    }
+
+    # UPDATE ... RETURNING: valida propiedad, actualiza y devuelve la fila
+    # en un solo round trip (sin campos que cambiar basta con leerla)
+    if values:
+        stmt = update(Project).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id
+        ).values(**values).returning(Project)
+    else:
+        stmt = select(Project).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id
+        )
     result = await db.execute(stmt)
     project = result.scalar_one_or_none()
 
@@ -115,21 +169,14 @@ async def update_project(
             detail="Proyecto no encontrado"
         )
 
-    # Actualizar solo los campos proporcionados
-    if project_data.name is not None:
-        project.name = project_data.name
-    if project_data.description is not None:
-        project.description = project_data.description
-
     await db.commit()
-    await db.refresh(project)
 
-    return ProjectResponse.model_validate(project)
+    return ORJSONResponse(_project_to_dict(project))
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
-    project_id: str,
+    project_id: UUID,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)]
 ) -> None:
@@ -138,18 +185,20 @@ async def delete_project(
 
     Solo el propietario puede eliminar el proyecto.
     """
-    stmt = select(Project).where(
+    # Un único DELETE, sin SELECT previo: basta con rowcount. Los análisis
+    # del proyecto los borra la FK (ON DELETE CASCADE).
+    # synchronize_session=False: no hay objetos Project cargados en la
+    # sesión que sincronizar
+    stmt = delete(Project).where(
         Project.id == project_id,
         Project.owner_id == current_user.id
-    )
+    ).execution_options(synchronize_session=False)
     result = await db.execute(stmt)
-    project = result.scalar_one_or_none()
 
-    if not project:
+    if result.rowcount == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Proyecto no encontrado"
         )
 
-    await db.delete(project)
     await db.commit()
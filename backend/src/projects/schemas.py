@@ -2,6 +2,7 @@
 Schemas de Pydantic para validación de datos de proyectos.
 """
 from datetime import datetime
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
@@ -49,10 +50,10 @@ class ProjectUpdate(BaseModel):
 class ProjectResponse(BaseModel):
     """Schema de respuesta con información del proyecto."""
 
-    id: str
+    id: UUID
     name: str
     description: str | None
-    owner_id: str
+    owner_id: UUID
     created_at: datetime
     updated_at: datetime
 
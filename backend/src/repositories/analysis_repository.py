@@ -4,7 +4,7 @@ Repositorio para operaciones de análisis en base de datos.
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, desc
+from sqlalchemy import desc, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.database import Analysis
@@ -54,7 +54,9 @@ class AnalysisRepository:
                 # Ya es un dict
                 functions_data.append(func)
 
-        analysis = Analysis(
+        # INSERT ... RETURNING: id y created_at vuelven en la misma sentencia,
+        # sin pasar por el flush de la unit of work
+        stmt = insert(Analysis).values(
             code=code,
             total_lines=metrics["total_lines"],
             code_lines=metrics["code_lines"],
@@ -63,12 +65,10 @@ class AnalysisRepository:
             num_classes=metrics["num_classes"],
             num_imports=metrics["num_imports"],
             functions_data=functions_data,
-        )
-
-        self.db.add(analysis)
-        await self.db.flush()  # Para obtener el ID generado
+        ).returning(Analysis)
 
-        return analysis
+        result = await self.db.execute(stmt)
+        return result.scalar_one()
 
     async def get_by_id(self, analysis_id: UUID) -> Optional[Analysis]:
         """
@@ -112,16 +112,15 @@ class AnalysisRepository:
         Returns:
             Response Pydantic
         """
-        # Convertir functions_data de JSON a lista de FunctionInfo
-        functions = []
-        if analysis.functions_data:
-            functions = [
-                FunctionInfo(**func_data)
-                for func_data in analysis.functions_data
-            ]
-
-        return AnalyzeResponse(
-            id=analysis.id,
+        # Datos de la BD ya tipados: model_construct evita revalidar cada
+        # campo (y cada FunctionInfo) en la conversión
+        functions = [
+            FunctionInfo.model_construct(**func_data)
+            for func_data in analysis.functions_data or []
+        ]
+
+        return AnalyzeResponse.model_construct(
+            id=UUID(analysis.id),
             total_lines=analysis.total_lines,
             code_lines=analysis.code_lines,
             complexity=analysis.complexity,
@@ -1,15 +1,20 @@
 """
 Servicios de IA para análisis de código.
 """
+from functools import lru_cache
+
 from src.core.config import settings
 from .base import AIProvider
 from .ollama_provider import OllamaProvider
 
 
+@lru_cache(maxsize=1)
 def get_ai_provider() -> AIProvider:
     """
     Factory para obtener el provider de IA configurado.
 
+    El provider se crea una sola vez y se reutiliza en todos los requests.
+
     Returns:
         AIProvider: Instancia del provider configurado
 
@@ -23,4 +28,14 @@ def get_ai_provider() -> AIProvider:
         raise ValueError(f"Unknown AI provider: {settings.ai_provider}")
 
 
-__all__ = ["AIProvider", "OllamaProvider", "get_ai_provider"]
+async def close_ai_provider() -> None:
+    """
+    Cierra el provider de IA si llegó a crearse.
+    Se debe llamar al shutdown de la aplicación.
+    """
+    if get_ai_provider.cache_info().currsize:
+        await get_ai_provider().close()
+        get_ai_provider.cache_clear()
+
+
+__all__ = ["AIProvider", "OllamaProvider", "close_ai_provider", "get_ai_provider"]
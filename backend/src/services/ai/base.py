@@ -48,3 +48,11 @@ class AIProvider(ABC):
             Código optimizado con comentarios explicando mejoras
         """
         pass
+
+    async def close(self) -> None:
+        """
+        Libera los recursos del provider (conexiones HTTP, etc.).
+
+        Se llama al shutdown de la aplicación. Por defecto no hace nada.
+        """
+        pass
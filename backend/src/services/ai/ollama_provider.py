@@ -1,13 +1,25 @@
 """
 Provider de IA usando Ollama (local).
 """
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from contextlib import aclosing
+
 import aiohttp
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any
 from src.core.config import settings
 from src.core.logger import logger
 from .base import AIProvider
 from .prompts import SUGGESTION_PROMPT, EXPLAIN_PROMPT, OPTIMIZE_PROMPT
 
+# Línea numerada de sugerencia ("1. ...", "2) ...", "3: ..."): captura el
+# texto sin el número ni los espacios de los extremos
+_SUGGESTION_RE = re.compile(
+    r"^[^\S\n]*\d+[.):][^\S\n]*([^\n]*?\S)[^\S\n]*$", re.MULTILINE
+)
+
 
 class OllamaProvider(AIProvider):
     """Provider de IA usando Ollama local."""
@@ -16,8 +28,68 @@ class OllamaProvider(AIProvider):
         self.base_url = settings.ollama_base_url
         self.model = settings.ollama_model
         self.timeout = settings.ollama_timeout
+        self.temperature = 0.7
+        # Cache LRU de respuestas: hash(model, temperature, prompt) -> texto
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cache_max = 512
+        # Sesión HTTP persistente: reutiliza conexiones keep-alive con Ollama
+        self._session: aiohttp.ClientSession | None = None
         logger.info(f"🤖 OllamaProvider initialized: {self.model} at {self.base_url}")
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Devuelve la sesión HTTP compartida, creándola en el primer uso.
+
+        Returns:
+            Sesión de aiohttp con pool de conexiones
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Cierra la sesión HTTP compartida."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _cache_key(self, prompt: str) -> str:
+        """Clave de cache: hash de modelo, temperatura y prompt."""
+        return hashlib.blake2b(
+            f"{self.model}\0{self.temperature}\0{prompt}".encode(),
+            digest_size=16
+        ).hexdigest()
+
+    def _cache_get(self, prompt: str) -> str | None:
+        """Devuelve la respuesta cacheada para el prompt, si existe."""
+        cache_key = self._cache_key(prompt)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            logger.debug("Ollama response served from cache")
+        return cached
+
+    def _cache_put(self, prompt: str, text: str) -> None:
+        """Guarda la respuesta en el cache LRU."""
+        self._cache[self._cache_key(prompt)] = text
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+    def _payload(self, prompt: str, stream: bool) -> Dict[str, Any]:
+        """Cuerpo de la petición a /api/generate."""
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": self.temperature,
+                "num_predict": 500,  # Máximo tokens de respuesta
+            }
+        }
+
     async def _generate(self, prompt: str) -> str:
         """
         Llamada interna a Ollama API.
@@ -31,34 +103,30 @@ class OllamaProvider(AIProvider):
         Raises:
             Exception: Si hay error en la comunicación con Ollama
         """
+        # Mismo prompt con el mismo modelo: devolver la respuesta cacheada
+        # en vez de repetir la inferencia
+        cached = self._cache_get(prompt)
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}/api/generate"
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.7,
-                "num_predict": 500,  # Máximo tokens de respuesta
-            }
-        }
+        payload = self._payload(prompt, stream=False)
 
         try:
             logger.debug(f"Calling Ollama: {url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        generated_text = result.get("response", "")
-                        logger.debug(f"Ollama response: {len(generated_text)} chars")
-                        return generated_text
-                    else:
-                        error = await response.text()
-                        logger.error(f"Ollama error: {error}")
-                        raise Exception(f"Ollama returned status {response.status}: {error}")
+            session = self._get_session()
+            async with session.post(url, json=payload) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    generated_text = result.get("response", "")
+                    logger.debug(f"Ollama response: {len(generated_text)} chars")
+
+                    self._cache_put(prompt, generated_text)
+                    return generated_text
+                else:
+                    error = await response.text()
+                    logger.error(f"Ollama error: {error}")
+                    raise Exception(f"Ollama returned status {response.status}: {error}")
         except aiohttp.ClientError as e:
             logger.error(f"Error connecting to Ollama: {e}")
             raise Exception(f"Failed to connect to Ollama: {str(e)}")
@@ -66,6 +134,54 @@ class OllamaProvider(AIProvider):
             logger.error(f"Unexpected error calling Ollama: {e}")
             raise
 
+    async def _generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Llamada a Ollama API en modo streaming.
+
+        Ollama envía una línea JSON por fragmento generado. Si el consumidor
+        deja de iterar antes del final, se cierra la conexión y Ollama
+        aborta la generación.
+
+        Args:
+            prompt: Prompt a enviar al modelo
+
+        Yields:
+            Fragmentos de texto según los genera el modelo
+
+        Raises:
+            Exception: Si hay error en la comunicación con Ollama
+        """
+        url = f"{self.base_url}/api/generate"
+        payload = self._payload(prompt, stream=True)
+
+        try:
+            logger.debug(f"Calling Ollama (stream): {url}")
+            session = self._get_session()
+            async with session.post(url, json=payload) as response:
+                if response.status != 200:
+                    error = await response.text()
+                    logger.error(f"Ollama error: {error}")
+                    raise Exception(f"Ollama returned status {response.status}: {error}")
+
+                done = False
+                try:
+                    async for raw in response.content:
+                        if not raw.strip():
+                            continue
+                        chunk = json.loads(raw)
+                        if chunk.get("response"):
+                            yield chunk["response"]
+                        if chunk.get("done"):
+                            done = True
+                            break
+                finally:
+                    # Corte anticipado: no reutilizar la conexión a medio leer
+                    if not done:
+                        response.close()
+        except aiohttp.ClientError as e:
+            logger.error(f"Error connecting to Ollama: {e}")
+            raise Exception(f"Failed to connect to Ollama: {str(e)}")
+
     async def generate_suggestions(self, code: str, analysis: Dict[str, Any]) -> List[str]:
         """Genera sugerencias de mejora para el código."""
         prompt = SUGGESTION_PROMPT.format(
@@ -76,19 +192,37 @@ class OllamaProvider(AIProvider):
         )
 
         try:
-            response = await self._generate(prompt)
-
-            # Parsear respuesta: buscar líneas numeradas
+            response = self._cache_get(prompt)
             suggestions = []
-            for line in response.split("\n"):
-                line = line.strip()
-                # Buscar líneas que empiecen con número seguido de punto o paréntesis
-                if line and len(line) > 2:
-                    if line[0].isdigit() and line[1] in ('.', ')', ':'):
-                        # Remover el número inicial y limpiar
-                        suggestion = line[2:].strip()
-                        if suggestion:
-                            suggestions.append(suggestion)
+
+            if response is None:
+                # Parsear según llega cada línea y cortar la generación en
+                # cuanto hay 5 sugerencias numeradas
+                parts: List[str] = []
+                pending = ""
+                async with aclosing(self._generate_stream(prompt)) as stream:
+                    async for fragment in stream:
+                        parts.append(fragment)
+                        pending += fragment
+                        # Parsear solo hasta la última línea completa
+                        cut = pending.rfind("\n")
+                        if cut < 0:
+                            continue
+                        suggestions += _SUGGESTION_RE.findall(pending, 0, cut)
+                        pending = pending[cut + 1:]
+                        if len(suggestions) >= 5:
+                            break
+                    else:
+                        suggestions += _SUGGESTION_RE.findall(pending)
+
+                response = "".join(parts)
+                logger.debug(f"Ollama response: {len(response)} chars")
+                # Las 5 primeras sugerencias se obtienen igual del texto
+                # parcial, así que también sirve para el cache
+                self._cache_put(prompt, response)
+            else:
+                # Un único recorrido del motor de regex sobre todo el texto
+                suggestions = _SUGGESTION_RE.findall(response)
 
             # Si no encontramos formato numerado, dividir por saltos de línea dobles
             if not suggestions:
@@ -1,56 +1,153 @@
 """
-AST Visitor para calcular complejidad ciclomática.
+AST Visitors para calcular complejidad ciclomática y métricas de código.
 """
 import ast
-from typing import Any
 
+from src.models.analyze import FunctionInfo
 
-class ComplexityVisitor(ast.NodeVisitor):
+
+# Tipos ligados a nivel de módulo: el recorrido compara type(node) por
+# identidad en lugar del despacho getattr("visit_" + clase) de NodeVisitor
+_AST = ast.AST
+_BoolOp = ast.BoolOp
+_ClassDef = ast.ClassDef
+_Import = ast.Import
+_ImportFrom = ast.ImportFrom
+_FunctionDef = ast.FunctionDef
+_AsyncFunctionDef = ast.AsyncFunctionDef
+
+# Nodos que suman un camino: if/elif, for, while, except y comprehensions
+_BRANCH_TYPES = frozenset({
+    ast.If, ast.For, ast.While, ast.ExceptHandler, ast.comprehension
+})
+
+
+def walk_complexity(node: ast.AST, counter: list[int]) -> None:
     """
-    Visitor que calcula complejidad ciclomática de código Python.
+    Acumula en counter[0] la complejidad ciclomática del subárbol.
 
     La complejidad ciclomática mide el número de caminos independientes
-    en el código. Comienza en 1 y se incrementa por:
+    en el código. Se incrementa por:
     - if, elif
     - for, while
     - except
     - and, or (operadores lógicos)
     - list/dict/set comprehensions
+
+    Args:
+        node: Nodo raíz del subárbol
+        counter: Lista de un elemento con el acumulado
+    """
+    t = type(node)
+    if t in _BRANCH_TYPES:
+        counter[0] += 1
+    elif t is _BoolOp:
+        counter[0] += len(node.values) - 1
+
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if type(value) is list:
+            for item in value:
+                if isinstance(item, _AST):
+                    walk_complexity(item, counter)
+        elif isinstance(value, _AST):
+            walk_complexity(value, counter)
+
+
+class MetricsVisitor:
+    """
+    Obtiene todas las métricas del AST en un único recorrido.
+
+    Además de la complejidad total (mismas reglas que walk_complexity)
+    cuenta clases e imports y construye la lista de funciones con su
+    complejidad. La complejidad de una función es 1 más los incrementos
+    producidos dentro de su subárbol (incluye funciones anidadas).
     """
 
     def __init__(self) -> None:
-        """Inicializa el visitor con complejidad 1."""
+        """Inicializa contadores y lista de funciones."""
         self.complexity = 1
+        self.classes = 0
+        self.imports = 0
+        self.functions: list[FunctionInfo] = []
 
-    def visit_If(self, node: ast.If) -> Any:
-        """Incrementa por cada if/elif."""
-        self.complexity += 1
-        self.generic_visit(node)
+    def visit(self, node: ast.AST) -> None:
+        """Recorre el nodo y todo su subárbol."""
+        t = type(node)
+        if t in _BRANCH_TYPES:
+            self.complexity += 1
+        elif t is _BoolOp:
+            self.complexity += len(node.values) - 1
+        elif t is _ClassDef:
+            self.classes += 1
+        elif t is _Import or t is _ImportFrom:
+            # Un import no contiene nodos que sumen
+            self.imports += 1
+            return
+        elif t is _FunctionDef or t is _AsyncFunctionDef:
+            self._visit_function(node)
+            return
 
-    def visit_For(self, node: ast.For) -> Any:
-        """Incrementa por cada for."""
-        self.complexity += 1
-        self.generic_visit(node)
+        self._visit_children(node)
 
-    def visit_While(self, node: ast.While) -> Any:
-        """Incrementa por cada while."""
-        self.complexity += 1
-        self.generic_visit(node)
+    def _visit_children(self, node: ast.AST) -> None:
+        """Visita los hijos directos del nodo."""
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, _AST):
+                        visit(item)
+            elif isinstance(value, _AST):
+                visit(value)
 
-    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> Any:
-        """Incrementa por cada except."""
-        self.complexity += 1
-        self.generic_visit(node)
+    def _visit_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        """Registra la función con la complejidad de su subárbol."""
+        # Reservar la posición para mantener el orden del código fuente
+        # (las funciones anidadas se visitan antes de cerrar esta)
+        index = len(self.functions)
+        self.functions.append(None)  # type: ignore[arg-type]
 
-    def visit_BoolOp(self, node: ast.BoolOp) -> Any:
-        """Incrementa por cada operador lógico (and/or)."""
-        self.complexity += len(node.values) - 1
-        self.generic_visit(node)
+        complexity_before = self.complexity
+        self._visit_children(node)
 
-    def visit_comprehension(self, node: ast.comprehension) -> Any:
-        """Incrementa por comprehensions."""
-        self.complexity += 1
-        self.generic_visit(node)
+        self.functions[index] = FunctionInfo(
+            name=node.name,
+            line_start=node.lineno,
+            line_end=node.end_lineno or node.lineno,
+            complexity=1 + self.complexity - complexity_before,
+        )
+
+
+def collect_metrics(tree: ast.AST) -> MetricsVisitor:
+    """
+    Recorre el árbol una sola vez y devuelve el visitor con las métricas.
+
+    Args:
+        tree: AST del código
+
+    Returns:
+        Visitor con complexity, classes, imports y functions
+    """
+    visitor = MetricsVisitor()
+    visitor.visit(tree)
+    return visitor
+
+
+def calculate_complexity_from_tree(node: ast.AST) -> int:
+    """
+    Calcula la complejidad ciclomática de un nodo AST ya parseado.
+
+    Args:
+        node: Árbol o subárbol (módulo, función...) a recorrer
+
+    Returns:
+        Complejidad ciclomática (mínimo 1)
+    """
+    counter = [1]
+    walk_complexity(node, counter)
+    return counter[0]
 
 
 def calculate_complexity(code: str) -> int:
@@ -66,10 +163,4 @@ def calculate_complexity(code: str) -> int:
     Raises:
         SyntaxError: Si el código tiene errores de sintaxis
     """
-    try:
-        tree = ast.parse(code)
-        visitor = ComplexityVisitor()
-        visitor.visit(tree)
-        return visitor.complexity
-    except SyntaxError:
-        raise
+    return calculate_complexity_from_tree(ast.parse(code))
@@ -2,10 +2,28 @@
 Servicio de análisis de código Python usando AST.
 """
 import ast
+import asyncio
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 from src.models.analyze import FunctionInfo
-from src.services.ast_visitor import calculate_complexity
+from src.services.ast_visitor import collect_metrics
+
+
+# Línea de código: tras la indentación hay un carácter que no es espacio
+# ni "#" (excluye líneas vacías y comentarios)
+_CODE_LINE_RE = re.compile(r"^[^\S\n]*[^\s#]", re.MULTILINE)
+
+# Pool de procesos para el análisis: recorrer el AST es CPU-bound y retiene
+# el GIL, así que en un hilo seguiría frenando el event loop
+_analysis_executor: ProcessPoolExecutor | None = None
+
+# Por debajo de este tamaño el análisis tarda menos que el envío al worker
+# (pickle del código y del resultado): se hace en el propio proceso
+_INLINE_MAX_CHARS = 2000
 
 
 class CodeAnalysisError(Exception):
@@ -24,7 +42,6 @@ class CodeAnalyzer:
             code: Código Python a analizar
         """
         self.code = code
-        self.lines = code.splitlines()
 
     def count_total_lines(self) -> int:
         """
@@ -33,7 +50,10 @@ class CodeAnalyzer:
         Returns:
             Número total de líneas
         """
-        return len(self.lines)
+        if not self.code:
+            return 0
+        # La última línea cuenta aunque no termine en salto de línea
+        return self.code.count("\n") + (0 if self.code.endswith("\n") else 1)
 
     def count_code_lines(self) -> int:
         """
@@ -42,13 +62,8 @@ class CodeAnalyzer:
         Returns:
             Número de líneas de código
         """
-        code_lines = 0
-        for line in self.lines:
-            stripped = line.strip()
-            # Ignorar líneas vacías y comentarios
-            if stripped and not stripped.startswith("#"):
-                code_lines += 1
-        return code_lines
+        # Un único recorrido en el motor de regex (C), sin lista de líneas
+        return len(_CODE_LINE_RE.findall(self.code))
 
     def parse_ast(self) -> ast.Module:
         """
@@ -98,28 +113,7 @@ class CodeAnalyzer:
         Returns:
             Lista de información de funciones
         """
-        functions: list[FunctionInfo] = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Calcular complejidad de la función
-                func_code = ast.get_source_segment(self.code, node)
-                func_complexity = 1  # Por defecto
-
-                if func_code:
-                    try:
-                        func_complexity = calculate_complexity(func_code)
-                    except:
-                        pass  # Si falla, dejar en 1
-
-                functions.append(FunctionInfo(
-                    name=node.name,
-                    line_start=node.lineno,
-                    line_end=node.end_lineno or node.lineno,
-                    complexity=func_complexity,
-                ))
-
-        return functions
+        return collect_metrics(tree).functions
 
     def count_classes(self, tree: ast.Module) -> int:
         """
@@ -131,7 +125,7 @@ class CodeAnalyzer:
         Returns:
             Número de clases
         """
-        return sum(1 for node in ast.walk(tree) if isinstance(node, ast.ClassDef))
+        return collect_metrics(tree).classes
 
     def count_imports(self, tree: ast.Module) -> int:
         """
@@ -143,11 +137,7 @@ class CodeAnalyzer:
         Returns:
             Número de imports
         """
-        imports = 0
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                imports += 1
-        return imports
+        return collect_metrics(tree).imports
 
     def analyze(self) -> dict[str, Any]:
         """
@@ -162,23 +152,17 @@ class CodeAnalyzer:
         # Parsear AST
         tree = self.parse_ast()
 
-        # Calcular complejidad total
-        try:
-            total_complexity = calculate_complexity(self.code)
-        except SyntaxError:
-            raise CodeAnalysisError("Error al calcular complejidad")
-
-        # Extraer métricas
-        functions = self.extract_functions(tree)
+        # Complejidad, funciones, clases e imports en un solo recorrido
+        metrics = collect_metrics(tree)
 
         return {
             "total_lines": self.count_total_lines(),
             "code_lines": self.count_code_lines(),
-            "complexity": total_complexity,
-            "num_functions": len(functions),
-            "num_classes": self.count_classes(tree),
-            "num_imports": self.count_imports(tree),
-            "functions": functions,
+            "complexity": metrics.complexity,
+            "num_functions": len(metrics.functions),
+            "num_classes": metrics.classes,
+            "num_imports": metrics.imports,
+            "functions": metrics.functions,
         }
 
 
@@ -195,9 +179,57 @@ def analyze_code(code: str) -> dict[str, Any]:
     Raises:
         CodeAnalysisError: Si hay error al analizar
     """
-    # Validar que el código no esté vacío
-    if not code.strip():
+    # Validar que el código no esté vacío antes de cualquier parse.
+    # isspace() se detiene en el primer carácter visible; strip() copiaba
+    # el texto entero
+    if not code or code.isspace():
         raise CodeAnalysisError("El código no puede estar vacío")
 
     analyzer = CodeAnalyzer(code)
     return analyzer.analyze()
+
+
+def start_analysis_executor() -> None:
+    """
+    Crea el pool de procesos del análisis, con un proceso por CPU.
+    Se debe llamar al startup de la aplicación.
+    """
+    global _analysis_executor
+    # spawn: no heredar por fork los hilos ni el event loop del servidor
+    _analysis_executor = ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def shutdown_analysis_executor() -> None:
+    """
+    Cierra el pool de procesos del análisis.
+    Se debe llamar al shutdown de la aplicación.
+    """
+    global _analysis_executor
+    if _analysis_executor is not None:
+        _analysis_executor.shutdown(wait=False, cancel_futures=True)
+        _analysis_executor = None
+
+
+async def aanalyze_code(code: str) -> dict[str, Any]:
+    """
+    Versión async de analyze_code: corre en el pool de procesos.
+
+    Sin pool (tests sin lifespan) usa el executor por defecto del loop.
+
+    Args:
+        code: Código Python a analizar
+
+    Returns:
+        Diccionario con métricas
+
+    Raises:
+        CodeAnalysisError: Si hay error al analizar
+    """
+    if len(code) <= _INLINE_MAX_CHARS:
+        return analyze_code(code)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_analysis_executor, analyze_code, code)